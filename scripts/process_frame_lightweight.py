@@ -1,19 +1,54 @@
 #!/usr/bin/env python3
+import os
 import sys
 import json
-import base64
+import struct
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 import mediapipe as mp
 from PIL import Image, ImageEnhance, ImageFilter
 from io import BytesIO
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# Make sure OpenCV uses its optimized code paths on every core
+CPU_COUNT = os.cpu_count() or 1
+cv2.setUseOptimized(True)
+cv2.setNumThreads(CPU_COUNT)
+
 # Initialize MediaPipe (lightweight AI models)
 mp_face_detection = mp.solutions.face_detection
-mp_face_mesh = mp.solutions.face_mesh
 mp_selfie_segmentation = mp.solutions.selfie_segmentation
 mp_drawing = mp.solutions.drawing_utils
 
+# Rec.601 luma weights in BGR order (as used by COLOR_BGR2GRAY)
+LUMA_BGR = np.array([0.114, 0.587, 0.299])
+
+# cv2.blendLinear is the fast path for mask blending; older OpenCV builds may lack it
+BLEND_LINEAR_AVAILABLE = hasattr(cv2, 'blendLinear')
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def blend_u8(frame, background, mask, out):
+        # Fused frame * mask + background * (1 - mask), parallel over rows
+        h, w = mask.shape
+        for y in prange(h):
+            for x in range(w):
+                m = mask[y, x]
+                for c in range(3):
+                    out[y, x, c] = np.uint8(frame[y, x, c] * m + background[y, x, c] * (1.0 - m) + 0.5)
+
 class LightweightAIProcessor:
     def __init__(self):
         # Use lighter MediaPipe models
@@ -21,27 +56,63 @@ class LightweightAIProcessor:
             model_selection=0,  # 0 for short-range (lighter), 1 for full-range
             min_detection_confidence=0.5
         )
-        self.face_mesh = mp_face_mesh.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
-            refine_landmarks=False,  # Disable for better performance
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
         self.selfie_segmentation = mp_selfie_segmentation.SelfieSegmentation(
             model_selection=0  # 0 for general model (lighter), 1 for landscape
         )
+        
+        # libturbojpeg for SIMD JPEG decode/encode, falling back to OpenCV
+        # when the Python bindings or the native library are missing
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                print(f"TurboJPEG unavailable, using OpenCV codecs: {e}", file=sys.stderr)
+        
+        # Worker threads for splitting expensive OpenCV filters into bands
+        # (OpenCV releases the GIL while it runs)
+        self._executor = ThreadPoolExecutor(max_workers=CPU_COUNT)
+        
+        # Synthetic backgrounds only depend on frame size, so build them once per size
+        self._bg_cache = {}
+        
+        # Per-stage output buffers reused across frames (see _scratch)
+        self._scratch_buffers = {}
+        
+        # Compile the Numba blend kernel up front when it is the blend fallback
+        if not BLEND_LINEAR_AVAILABLE and NUMBA_AVAILABLE:
+            warmup = np.zeros((2, 2, 3), dtype=np.uint8)
+            blend_u8(warmup, warmup, np.zeros((2, 2), dtype=np.float32), np.empty_like(warmup))
+        
+        # Sepia matrix in the layout cv2.transform expects, reordered for BGR frames
+        self._sepia_T = np.array([[0.393, 0.769, 0.189],
+                                  [0.349, 0.686, 0.168],
+                                  [0.272, 0.534, 0.131]]).T[::-1, ::-1]
+        
+        # 3x3 BGR matrices for the fixed color filters
+        gray = np.outer(np.ones(3), LUMA_BGR)
+        self._color_filter_matrices = {
+            'warm': np.diag([0.85, 1.0, 1.15]),  # More red, less blue
+            'cool': np.diag([1.15, 1.0, 0.85]),  # Less red, more blue
+            'bw': gray,
+            'sepia': np.diag([1.0, 0.9, 0.8]) @ gray,  # Gray, reduce red, slightly reduce green
+            'vibrant': self._saturation_matrix(1.3),  # Increase saturation
+        }
     
-    def process_frame(self, frame_data, filters):
+    @staticmethod
+    def _saturation_matrix(factor):
+        # 3x3 BGR matrix for cv2.transform that scales each pixel's distance
+        # from its luma: factor * I + (1 - factor) * luma projection
+        return factor * np.eye(3) + (1 - factor) * np.outer(np.ones(3), LUMA_BGR)
+    
+    def process_frame(self, frame_bytes, filters):
+        # Nothing to apply: hand the JPEG back without decoding/re-encoding
+        if self.is_passthrough(filters):
+            return frame_bytes
+        
         try:
-            # Decode base64 frame
-            if ',' in frame_data:
-                frame_bytes = base64.b64decode(frame_data.split(',')[1])
-            else:
-                frame_bytes = base64.b64decode(frame_data)
-            
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            # Decode raw JPEG bytes
+            frame = self._decode_jpeg(frame_bytes)
             
             if frame is None:
                 raise ValueError("Could not decode frame")
@@ -52,29 +123,67 @@ class LightweightAIProcessor:
                 scale = 1280 / width
                 new_width = int(width * scale)
                 new_height = int(height * scale)
-                frame = cv2.resize(frame, (new_width, new_height))
-            
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Apply filters based on settings
-            processed_frame = self.apply_filters(rgb_frame, filters)
+                frame = cv2.resize(frame, (new_width, new_height),
+                                   dst=self._scratch('resized', (new_height, new_width, 3)),
+                                   interpolation=cv2.INTER_AREA)  # Box filter for downscaling
             
-            # Convert back to BGR for encoding
-            bgr_frame = cv2.cvtColor(processed_frame, cv2.COLOR_RGB2BGR)
+            # Apply filters based on settings (frame stays BGR throughout;
+            # only the MediaPipe calls convert to RGB)
+            processed_frame = self.apply_filters(frame, filters)
             
-            # Encode back to base64 with compression
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 75]  # Reduce quality for performance
-            _, buffer = cv2.imencode('.jpg', bgr_frame, encode_param)
-            encoded_frame = base64.b64encode(buffer).decode('utf-8')
-            
-            return f"data:image/jpeg;base64,{encoded_frame}"
+            # Encode back to JPEG with compression
+            return self._encode_jpeg(processed_frame, quality=75)  # Reduce quality for performance
             
         except Exception as e:
             raise Exception(f"Frame processing error: {str(e)}")
     
+    def _scratch(self, name, shape, dtype=np.uint8):
+        # Output buffer for one pipeline stage, passed to OpenCV via dst=.
+        # Frames are processed one at a time, so each stage can reuse its buffer
+        # and only reallocates when the frame size changes.
+        buffer = self._scratch_buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._scratch_buffers[name] = buffer
+        return buffer
+    
+    @staticmethod
+    def is_passthrough(filters):
+        # True when no filter in the set would change the frame
+        face_enhancement = filters.get('faceEnhancement', False) and any(
+            filters.get(key, 0) > 0 for key in ('skinSmoothing', 'eyeBrightening', 'teethWhitening')
+        )
+        return not (
+            filters.get('backgroundRemoval', False)
+            or face_enhancement
+            or filters.get('brightness', 0) != 0
+            or filters.get('contrast', 0) != 0
+            or filters.get('saturation', 0) != 0
+            or filters.get('vintage', False)
+            or filters.get('colorFilter', 'none') != 'none'
+            or filters.get('blur', 0) > 0
+        )
+    
+    def _decode_jpeg(self, frame_bytes):
+        if self._tj is not None:
+            try:
+                return self._tj.decode(frame_bytes, pixel_format=TJPF_BGR)
+            except OSError:
+                return None
+        nparr = np.frombuffer(frame_bytes, np.uint8)
+        return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    def _encode_jpeg(self, frame, quality):
+        if self._tj is not None:
+            # 4:2:0 chroma subsampling, matching cv2.imencode (TurboJPEG defaults to 4:2:2)
+            return self._tj.encode(frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+        _, buffer = cv2.imencode('.jpg', frame, encode_param)
+        return buffer.tobytes()
+    
     def apply_filters(self, frame, filters):
-        processed = frame.copy()
+        # Filters run strictly in sequence, so each stage may reuse its input buffer
+        processed = frame
         
         # Background removal and replacement (lightweight)
         if filters.get('backgroundRemoval', False):
@@ -84,53 +193,54 @@ class LightweightAIProcessor:
         if filters.get('faceEnhancement', False):
             processed = self.enhance_face_opencv(processed, filters)
         
-        # Color adjustments (pure OpenCV/NumPy)
+        # Color adjustments and color effects (single cv2.transform pass)
         processed = self.adjust_colors_fast(processed, filters)
         
-        # Special effects (lightweight)
+        # Remaining special effects (lightweight)
         processed = self.apply_effects_fast(processed, filters)
         
         return processed
     
     def remove_background_lightweight(self, frame, replacement_type):
         try:
-            # Use MediaPipe for segmentation (lighter model)
-            results = self.selfie_segmentation.process(frame)
+            # Use MediaPipe for segmentation (lighter model, expects RGB).
+            # The model runs at 256x256, so infer on a small frame and upscale the mask
+            h, w = frame.shape[:2]
+            small = cv2.resize(frame, (256, 256), dst=self._scratch('segmentation_small', (256, 256, 3)),
+                               interpolation=cv2.INTER_AREA)
+            rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self._scratch('segmentation_rgb', (256, 256, 3)))
+            results = self.selfie_segmentation.process(rgb_small)
             
             if results.segmentation_mask is not None:
-                # Create mask with some smoothing
-                mask = results.segmentation_mask > 0.1  # Lower threshold for better edge detection
-                
-                # Smooth the mask edges
-                mask_uint8 = (mask * 255).astype(np.uint8)
-                mask_smooth = cv2.GaussianBlur(mask_uint8, (5, 5), 0)
-                mask_smooth = mask_smooth / 255.0
+                segmentation_mask = cv2.resize(results.segmentation_mask.astype(np.float32, copy=False), (w, h),
+                                               dst=self._scratch('mask', (h, w), np.float32),
+                                               interpolation=cv2.INTER_LINEAR)
                 
-                # Create 3D mask
-                mask_3d = np.stack([mask_smooth] * 3, axis=-1)
+                # Smooth the float32 mask edges, then soft-threshold it around 0.1
+                # (ramp from 0.05 to 0.15; low threshold for better edge detection)
+                mask_smooth = cv2.GaussianBlur(segmentation_mask, (5, 5), 0,
+                                               dst=self._scratch('mask_smooth', (h, w), np.float32))
+                mask_smooth -= 0.05
+                mask_smooth *= 10.0
+                np.clip(mask_smooth, 0.0, 1.0, out=mask_smooth)
+                inverse_mask = np.subtract(1.0, mask_smooth, out=self._scratch('inverse_mask', (h, w), np.float32))
                 
                 if replacement_type == 'blur':
                     # Blur background
-                    blurred = cv2.GaussianBlur(frame, (15, 15), 0)
-                    frame = (frame * mask_3d + blurred * (1 - mask_3d)).astype(np.uint8)
+                    blurred = cv2.GaussianBlur(frame, (15, 15), 0, dst=self._scratch('background', frame.shape))
+                    frame = self._blend(frame, blurred, mask_smooth, inverse_mask)
                 elif replacement_type == 'gradient':
-                    # Create simple gradient background
-                    h, w = frame.shape[:2]
-                    gradient = np.linspace(50, 200, h).reshape(h, 1, 1)
-                    gradient = np.repeat(gradient, w, axis=1)
-                    gradient = np.stack([gradient * 0.8, gradient * 0.9, gradient], axis=2).astype(np.uint8)
-                    frame = (frame * mask_3d + gradient * (1 - mask_3d)).astype(np.uint8)
+                    # Simple gradient background
+                    gradient = self._get_gradient_bg(h, w)
+                    frame = self._blend(frame, gradient, mask_smooth, inverse_mask)
                 elif replacement_type == 'beach':
                     # Simple beach-like gradient
-                    h, w = frame.shape[:2]
-                    sky = np.full((h//2, w, 3), [135, 206, 235], dtype=np.uint8)  # Sky blue
-                    sand = np.full((h - h//2, w, 3), [238, 203, 173], dtype=np.uint8)  # Sandy brown
-                    beach_bg = np.vstack([sky, sand])
-                    frame = (frame * mask_3d + beach_bg * (1 - mask_3d)).astype(np.uint8)
+                    beach_bg = self._get_beach_bg(h, w)
+                    frame = self._blend(frame, beach_bg, mask_smooth, inverse_mask)
                 else:
                     # Default: darken background
-                    darkened = (frame * 0.3).astype(np.uint8)
-                    frame = (frame * mask_3d + darkened * (1 - mask_3d)).astype(np.uint8)
+                    darkened = cv2.convertScaleAbs(frame, alpha=0.3, dst=self._scratch('background', frame.shape))
+                    frame = self._blend(frame, darkened, mask_smooth, inverse_mask)
         except Exception as e:
             print(f"Background removal error: {e}", file=sys.stderr)
             # Return original frame if background removal fails
@@ -138,10 +248,38 @@ class LightweightAIProcessor:
         
         return frame
     
+    def _blend(self, frame, background, mask, inverse_mask):
+        # frame * mask + background * (1 - mask) in a single pass without
+        # full-size float temporaries
+        out = self._scratch('blend', frame.shape)
+        if BLEND_LINEAR_AVAILABLE:
+            return cv2.blendLinear(frame, background, mask, inverse_mask, dst=out)
+        if NUMBA_AVAILABLE:
+            blend_u8(frame, background, mask, out)
+            return out
+        return (frame * mask[..., None] + background * inverse_mask[..., None] + 0.5).astype(np.uint8)
+    
+    def _get_gradient_bg(self, h, w):
+        key = ('gradient', h, w)
+        if key not in self._bg_cache:
+            gradient = np.linspace(50, 200, h)[:, None, None] * np.array([1.0, 0.9, 0.8])
+            # order='C' so OpenCV and Numba get an interleaved buffer they can use without copying
+            self._bg_cache[key] = np.broadcast_to(gradient, (h, w, 3)).astype(np.uint8, order='C')
+        return self._bg_cache[key]
+    
+    def _get_beach_bg(self, h, w):
+        key = ('beach', h, w)
+        if key not in self._bg_cache:
+            sky = np.full((h//2, w, 3), [235, 206, 135], dtype=np.uint8)  # Sky blue
+            sand = np.full((h - h//2, w, 3), [173, 203, 238], dtype=np.uint8)  # Sandy brown
+            self._bg_cache[key] = np.vstack([sky, sand])
+        return self._bg_cache[key]
+    
     def enhance_face_opencv(self, frame, filters):
         try:
-            # Detect faces using MediaPipe
-            results = self.face_detection.process(frame)
+            # Detect faces using MediaPipe (expects RGB)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._scratch('face_rgb', frame.shape))
+            results = self.face_detection.process(rgb_frame)
             
             if results.detections:
                 for detection in results.detections:
@@ -155,26 +293,23 @@ class LightweightAIProcessor:
                     height = min(h - y, int(bbox.height * h))
                     
                     if width > 0 and height > 0:
-                        # Extract face region
-                        face_region = frame[y:y+height, x:x+width].copy()
+                        # View of the face region; the sub-filters write into it in place
+                        face_region = frame[y:y+height, x:x+width]
                         
                         # Apply skin smoothing (lightweight bilateral filter)
                         smoothing = filters.get('skinSmoothing', 0) / 100.0
                         if smoothing > 0:
-                            face_region = self.smooth_skin_fast(face_region, smoothing)
+                            self.smooth_skin_fast(face_region, smoothing)
                         
                         # Apply eye brightening (simple brightness adjustment to upper face)
                         eye_brightness = filters.get('eyeBrightening', 0) / 100.0
                         if eye_brightness > 0:
-                            face_region = self.brighten_eyes_fast(face_region, eye_brightness)
+                            self.brighten_eyes_fast(face_region, eye_brightness)
                         
                         # Apply teeth whitening (detect mouth area and enhance)
                         teeth_whitening = filters.get('teethWhitening', 0) / 100.0
                         if teeth_whitening > 0:
-                            face_region = self.whiten_teeth_fast(face_region, teeth_whitening)
-                        
-                        # Put face back
-                        frame[y:y+height, x:x+width] = face_region
+                            self.whiten_teeth_fast(face_region, teeth_whitening)
         except Exception as e:
             print(f"Face enhancement error: {e}", file=sys.stderr)
             # Return original frame if face enhancement fails
@@ -188,96 +323,127 @@ class LightweightAIProcessor:
         if kernel_size % 2 == 0:
             kernel_size += 1
         
-        smoothed = cv2.bilateralFilter(face, kernel_size, 40, 40)
-        return cv2.addWeighted(face, 1 - intensity * 0.7, smoothed, intensity * 0.7, 0)
+        # Bilateral filter at half resolution (cost grows with kernel area),
+        # then upscale the smoothed result back to the face size
+        h, w = face.shape[:2]
+        if min(h, w) >= 32:
+            small_kernel = max(3, kernel_size // 2)
+            if small_kernel % 2 == 0:
+                small_kernel += 1
+            small = cv2.resize(face, (w // 2, h // 2), interpolation=cv2.INTER_AREA)
+            smoothed = self._bilateral_filter_banded(small, small_kernel, 40, 40)
+            smoothed = cv2.resize(smoothed, (w, h), interpolation=cv2.INTER_LINEAR)
+        else:
+            smoothed = self._bilateral_filter_banded(face, kernel_size, 40, 40)
+        cv2.addWeighted(face, 1 - intensity * 0.7, smoothed, intensity * 0.7, 0, dst=face)
+        return face
+    
+    def _bilateral_filter_banded(self, image, d, sigma_color, sigma_space):
+        # Run the bilateral filter on horizontal bands in parallel. Each band
+        # carries d // 2 rows of context so the result matches a single call.
+        h = image.shape[0]
+        bands = min(CPU_COUNT, h // 32)
+        if bands < 2:
+            return cv2.bilateralFilter(image, d, sigma_color, sigma_space)
+        
+        radius = d // 2
+        bounds = np.linspace(0, h, bands + 1).astype(int)
+        
+        def filter_band(i):
+            top, bottom = bounds[i], bounds[i + 1]
+            start, stop = max(0, top - radius), min(h, bottom + radius)
+            filtered = cv2.bilateralFilter(image[start:stop], d, sigma_color, sigma_space)
+            return filtered[top - start:bottom - start]
+        
+        return np.vstack(list(self._executor.map(filter_band, range(bands))))
     
     def brighten_eyes_fast(self, face, intensity):
         # Simple brightness adjustment for eye region (top 1/3 of face)
         h = face.shape[0]
-        eye_region = face[:h//3, :].copy()
-        brightened = cv2.convertScaleAbs(eye_region, alpha=1 + intensity * 0.2, beta=intensity * 15)
-        face[:h//3, :] = brightened
+        eye_region = face[:h//3, :]
+        cv2.convertScaleAbs(eye_region, alpha=1 + intensity * 0.2, beta=intensity * 15, dst=eye_region)
         return face
     
     def whiten_teeth_fast(self, face, intensity):
         # Simple teeth whitening for mouth region (bottom 1/3 of face)
         h = face.shape[0]
-        mouth_region = face[2*h//3:, :].copy()
+        mouth_region = face[2*h//3:, :]
         
         # Convert to HSV for better color manipulation
-        hsv = cv2.cvtColor(mouth_region, cv2.COLOR_RGB2HSV)
+        hsv = cv2.cvtColor(mouth_region, cv2.COLOR_BGR2HSV)
         
         # Increase brightness and reduce saturation slightly
         hsv[:, :, 2] = cv2.add(hsv[:, :, 2], int(intensity * 20))  # Increase brightness
         hsv[:, :, 1] = cv2.multiply(hsv[:, :, 1], 1 - intensity * 0.1)  # Reduce saturation slightly
         
-        whitened = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-        face[2*h//3:, :] = whitened
+        cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=mouth_region)
         return face
     
     def adjust_colors_fast(self, frame, filters):
-        # Fast color adjustments using OpenCV
-        processed = frame.copy()
+        # Color adjustments and color effects are all affine per pixel, so
+        # consecutive stages share a single pass. A pass only ends where the
+        # old separate passes clamped to 0..255 in a way that changes the
+        # result, i.e. after a stage that can push pixels out of range.
+        processed = frame
         
-        # Brightness
-        brightness = filters.get('brightness', 0)
-        if brightness != 0:
-            processed = cv2.convertScaleAbs(processed, alpha=1, beta=brightness * 2)
+        lut = self._brightness_contrast_lut(filters)
+        if lut is not None:
+            processed = cv2.LUT(processed, lut, dst=self._scratch('color_levels', frame.shape))
+        
+        for i, matrix in enumerate(self._color_matrices(filters)):
+            processed = cv2.transform(processed, matrix, dst=self._scratch(f'color_{i}', frame.shape))
         
-        # Contrast
+        return processed
+    
+    def _brightness_contrast_lut(self, filters):
+        # Brightness then contrast, each clamped, folded into one lookup table
+        brightness = filters.get('brightness', 0)
         contrast = filters.get('contrast', 0)
-        if contrast != 0:
-            alpha = 1 + (contrast / 100.0)
-            processed = cv2.convertScaleAbs(processed, alpha=alpha, beta=0)
+        if brightness == 0 and contrast == 0:
+            return None
+        alpha = 1 + (contrast / 100.0)
+        lut = np.clip(np.rint(np.arange(256) + brightness * 2), 0, 255)
+        return np.clip(np.rint(lut * alpha), 0, 255).astype(np.uint8)
+    
+    def _color_matrices(self, filters):
+        # 3x4 matrices for cv2.transform, one per clamped pass, in the order
+        # the stages used to run. Each stage is (matrix, can_leave_range).
+        stages = []
         
-        # Saturation
+        # Saturation (desaturating blends towards luma and stays in range)
         saturation = filters.get('saturation', 0)
         if saturation != 0:
-            hsv = cv2.cvtColor(processed, cv2.COLOR_RGB2HSV)
-            hsv[:, :, 1] = cv2.multiply(hsv[:, :, 1], 1 + saturation / 100.0)
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
-            processed = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
+            stages.append((self._saturation_matrix(1 + saturation / 100.0), saturation > 0))
         
-        return processed
-    
-    def apply_effects_fast(self, frame, filters):
-        processed = frame.copy()
-        
-        # Vintage effect (fast sepia)
+        # Vintage effect (sepia rows sum to well above 1)
         if filters.get('vintage', False):
-            # Fast sepia transformation
-            sepia_filter = np.array([[0.393, 0.769, 0.189],
-                                   [0.349, 0.686, 0.168],
-                                   [0.272, 0.534, 0.131]])
-            processed = cv2.transform(processed, sepia_filter.T)
-            processed = np.clip(processed, 0, 255).astype(np.uint8)
-        
-        # Color filters (fast implementations)
+            stages.append((self._sepia_T, True))
+        
+        # Color filters (last stage, so the final transform clamps it)
         color_filter = filters.get('colorFilter', 'none')
-        if color_filter == 'warm':
-            # Increase red, decrease blue
-            processed[:, :, 0] = np.clip(processed[:, :, 0] * 1.15, 0, 255)  # More red
-            processed[:, :, 2] = np.clip(processed[:, :, 2] * 0.85, 0, 255)  # Less blue
-        elif color_filter == 'cool':
-            # Decrease red, increase blue
-            processed[:, :, 0] = np.clip(processed[:, :, 0] * 0.85, 0, 255)  # Less red
-            processed[:, :, 2] = np.clip(processed[:, :, 2] * 1.15, 0, 255)  # More blue
-        elif color_filter == 'bw':
-            # Fast grayscale conversion
-            gray = cv2.cvtColor(processed, cv2.COLOR_RGB2GRAY)
-            processed = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-        elif color_filter == 'sepia':
-            # Quick sepia effect
-            processed = cv2.cvtColor(processed, cv2.COLOR_RGB2GRAY)
-            processed = cv2.cvtColor(processed, cv2.COLOR_GRAY2RGB)
-            processed[:, :, 0] = np.clip(processed[:, :, 0] * 0.8, 0, 255)  # Reduce red
-            processed[:, :, 1] = np.clip(processed[:, :, 1] * 0.9, 0, 255)  # Slightly reduce green
-        elif color_filter == 'vibrant':
-            # Increase saturation for vibrant look
-            hsv = cv2.cvtColor(processed, cv2.COLOR_RGB2HSV)
-            hsv[:, :, 1] = cv2.multiply(hsv[:, :, 1], 1.3)
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
-            processed = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
+        if color_filter in self._color_filter_matrices:
+            stages.append((self._color_filter_matrices[color_filter], True))
+        
+        passes = [[]]
+        for matrix, can_leave_range in stages:
+            passes[-1].append(matrix)
+            if can_leave_range:
+                passes.append([])
+        return [self._compose(matrices) for matrices in passes if matrices]
+    
+    @staticmethod
+    def _compose(stages):
+        # Compose as 4x4 homogeneous matrices, later stages applied last
+        combined = np.eye(4)
+        for stage in stages:
+            stage_4x4 = np.eye(4)
+            stage_4x4[:3, :stage.shape[1]] = stage
+            combined = stage_4x4 @ combined
+        return combined[:3]
+    
+    def apply_effects_fast(self, frame, filters):
+        # Color effects are folded into adjust_colors_fast's matrix
+        processed = frame
         
         # Background blur (if not using background removal)
         blur_amount = filters.get('blur', 0)
@@ -286,38 +452,59 @@ class LightweightAIProcessor:
             kernel_size = max(3, blur_amount * 2 + 1)
             if kernel_size % 2 == 0:
                 kernel_size += 1
-            processed = cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0)
+            processed = cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0,
+                                         dst=self._scratch('blur', processed.shape))
         
         return processed
 
+def read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError("Unexpected end of input")
+    return data
+
+def read_chunk(stream):
+    # Each chunk is a 4-byte big-endian length followed by the payload
+    (length,) = struct.unpack(">I", read_exact(stream, 4))
+    return read_exact(stream, length)
+
+def write_chunk(stream, payload):
+    stream.write(struct.pack(">I", len(payload)) + payload)
+
+def write_response(stream, header, frame_bytes=b''):
+    write_chunk(stream, json.dumps(header).encode('utf-8'))
+    write_chunk(stream, frame_bytes)
+    stream.flush()
+
 def main():
-    try:
-        # Read input from stdin
-        input_data = sys.stdin.read()
-        data = json.loads(input_data)
-        
-        frame_data = data['frameData']
-        filters = data['filters']
-        
-        # Process frame with lightweight AI
-        processor = LightweightAIProcessor()
-        processed_frame = processor.process_frame(frame_data, filters)
-        
-        # Output result
-        result = {
-            'success': True,
-            'processedFrame': processed_frame
-        }
-        
-        print(json.dumps(result))
+    # Framed protocol: a JSON header chunk ({"filters": {...}}) followed by
+    # a raw JPEG chunk; the response mirrors it with a status header.
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    
+    # Initialize the AI models once and keep serving frames until stdin closes
+    processor = LightweightAIProcessor()
+    
+    while True:
+        try:
+            # Read next request from stdin
+            header_bytes = read_chunk(stdin)
+            frame_bytes = read_chunk(stdin)
+        except EOFError:
+            break
         
-    except Exception as e:
-        error_result = {
-            'success': False,
-            'error': str(e)
-        }
-        print(json.dumps(error_result), file=sys.stderr)
-        sys.exit(1)
+        try:
+            filters = json.loads(header_bytes).get('filters', {})
+            
+            # Process frame with lightweight AI
+            processed_frame = processor.process_frame(frame_bytes, filters)
+            
+            # Output result
+            write_response(stdout, {'success': True}, processed_frame)
+            
+        except Exception as e:
+            write_response(stdout, {'success': False, 'error': str(e)})
+            print(f"Frame processing failed: {e}", file=sys.stderr)
 
 if __name__ == '__main__':
     main()
@@ -43,11 +43,12 @@ fi
 print_status "Installing Python and lightweight AI processing dependencies..."
 sudo apt install -y python3 python3-pip python3-venv
 sudo apt install -y libopencv-dev python3-opencv
+sudo apt install -y libturbojpeg
 sudo apt install -y ffmpeg
 
 # Install lightweight Python libraries only
 print_status "Installing lightweight AI processing libraries..."
-pip3 install --user opencv-python mediapipe numpy pillow websockets
+pip3 install --user opencv-python mediapipe numpy pillow websockets PyTurboJPEG
 
 print_status "✅ Skipping TensorFlow installation (using lightweight alternatives)"
 
@@ -317,6 +318,11 @@ async function processVideoFrame(clientId, payload, ws) {
     // Process frame with lightweight Python AI pipeline
     const processedFrame = await processFrameWithLightweightAI(frameData, stream.filters);
     
+    // Frame was dropped because the processor is busy
+    if (!processedFrame) {
+      return;
+    }
+    
     // Send processed frame back
     ws.send(JSON.stringify({
       type: 'processed-frame',
@@ -347,58 +353,150 @@ async function processVideoFrame(clientId, payload, ws) {
   }
 }
 
+// Frames exchanged with process_frame.py are length-prefixed chunks:
+// a 4-byte big-endian length followed by the payload bytes.
+function encodeChunk(payload) {
+  const length = Buffer.alloc(4);
+  length.writeUInt32BE(payload.length, 0);
+  return Buffer.concat([length, payload]);
+}
+
+// Long-running Python worker, spawned on first use so the AI models are
+// only initialized once. Responses come back in request order.
+let frameWorker = null;
+
+// Frames already queued on the worker before new ones are dropped
+const MAX_PENDING_FRAMES = 3;
+
+function getFrameWorker() {
+  if (frameWorker) {
+    return frameWorker;
+  }
+  
+  const python = spawn('python3', ['process_frame.py'], {
+    stdio: ['pipe', 'pipe', 'pipe']
+  });
+  
+  const worker = {
+    python,
+    pending: [],
+    buffer: Buffer.alloc(0)
+  };
+  
+  python.stdout.on('data', (data) => {
+    worker.buffer = Buffer.concat([worker.buffer, data]);
+    
+    // Each response is a JSON status chunk followed by a JPEG chunk
+    while (worker.buffer.length >= 4) {
+      const headerLength = worker.buffer.readUInt32BE(0);
+      const frameOffset = 4 + headerLength;
+      if (worker.buffer.length < frameOffset + 4) {
+        break;
+      }
+      const frameLength = worker.buffer.readUInt32BE(frameOffset);
+      const end = frameOffset + 4 + frameLength;
+      if (worker.buffer.length < end) {
+        break;
+      }
+      
+      const header = worker.buffer.subarray(4, frameOffset);
+      const frame = worker.buffer.subarray(frameOffset + 4, end);
+      worker.buffer = worker.buffer.subarray(end);
+      
+      const request = worker.pending.shift();
+      if (!request || request.settled) {
+        continue;
+      }
+      
+      request.settled = true;
+      clearTimeout(request.timeout);
+      try {
+        const result = JSON.parse(header.toString('utf8'));
+        if (result.success) {
+          request.resolve(`data:image/jpeg;base64,${frame.toString('base64')}`);
+        } else {
+          request.reject(new Error(result.error || 'Processing failed'));
+        }
+      } catch (e) {
+        request.reject(new Error('Failed to parse Python output'));
+      }
+    }
+  });
+  
+  python.stderr.on('data', (data) => {
+    const message = data.toString().trim();
+    if (message) {
+      console.error(`Python worker: ${message}`);
+    }
+  });
+  
+  const failPending = (message) => {
+    if (frameWorker === worker) {
+      frameWorker = null;
+    }
+    for (const request of worker.pending) {
+      if (!request.settled) {
+        request.settled = true;
+        clearTimeout(request.timeout);
+        request.reject(new Error(message));
+      }
+    }
+    worker.pending = [];
+  };
+  
+  python.on('close', (code) => {
+    failPending(`Python process exited with code ${code}`);
+  });
+  
+  python.on('error', (err) => {
+    failPending(`Failed to spawn Python process: ${err.message}`);
+  });
+  
+  python.stdin.on('error', (err) => {
+    failPending(`Failed to write to Python process: ${err.message}`);
+  });
+  
+  frameWorker = worker;
+  return worker;
+}
+
 async function processFrameWithLightweightAI(frameData, filters) {
   return new Promise((resolve, reject) => {
-    const timeout = setTimeout(() => {
-      reject(new Error('Frame processing timeout'));
-    }, 10000); // 10 second timeout
+    const worker = getFrameWorker();
     
-    // Spawn Python process for lightweight AI processing
-    const python = spawn('python3', ['process_frame.py'], {
-      stdio: ['pipe', 'pipe', 'pipe']
-    });
-    
-    let output = '';
-    let error = '';
-    
-    python.stdout.on('data', (data) => {
-      output += data.toString();
-    });
+    // Drop the frame when the worker is falling behind, rather than letting
+    // the queue grow with frames that will time out anyway
+    if (worker.pending.length >= MAX_PENDING_FRAMES) {
+      resolve(null);
+      return;
+    }
     
-    python.stderr.on('data', (data) => {
-      error += data.toString();
-    });
+    const request = { resolve, reject, settled: false };
     
-    python.on('close', (code) => {
-      clearTimeout(timeout);
-      
-      if (code === 0) {
-        try {
-          const result = JSON.parse(output);
-          if (result.success) {
-            resolve(result.processedFrame);
-          } else {
-            reject(new Error(result.error || 'Processing failed'));
-          }
-        } catch (e) {
-          reject(new Error('Failed to parse Python output'));
-        }
-      } else {
-        reject(new Error(`Python process failed with code ${code}: ${error}`));
+    request.timeout = setTimeout(() => {
+      // A stuck worker would time out every later frame too, so kill it;
+      // its close handler rejects the rest and the next frame respawns it
+      request.settled = true;
+      reject(new Error('Frame processing timeout'));
+      if (frameWorker === worker) {
+        frameWorker = null;
       }
-    });
+      worker.python.kill();
+    }, 10000); // 10 second timeout
     
-    python.on('error', (err) => {
-      clearTimeout(timeout);
-      reject(new Error(`Failed to spawn Python process: ${err.message}`));
-    });
+    worker.pending.push(request);
     
-    // Send input data to Python process
+    // Send filters header and raw JPEG bytes to the Python worker
     try {
-      python.stdin.write(JSON.stringify({ frameData, filters }));
-      python.stdin.end();
+      // Strip the data-URL prefix without splitting the whole payload
+      const commaIndex = frameData.indexOf(',');
+      const base64Data = commaIndex >= 0 ? frameData.slice(commaIndex + 1) : frameData;
+      worker.python.stdin.write(encodeChunk(Buffer.from(JSON.stringify({ filters }))));
+      worker.python.stdin.write(encodeChunk(Buffer.from(base64Data, 'base64')));
     } catch (err) {
-      clearTimeout(timeout);
+      worker.pending.splice(worker.pending.indexOf(request), 1);
+      request.settled = true;
+      clearTimeout(request.timeout);
       reject(new Error(`Failed to write to Python process: ${err.message}`));
     }
   });
@@ -464,18 +562,13 @@ cp ../process_frame_lightweight.py process_frame.py || {
 #!/usr/bin/env python3
 import sys
 import json
-import base64
+import struct
 import cv2
 import numpy as np
 
-def process_frame_basic(frame_data, filters):
+def process_frame_basic(frame_bytes, filters):
     try:
-        # Decode base64 frame
-        if ',' in frame_data:
-            frame_bytes = base64.b64decode(frame_data.split(',')[1])
-        else:
-            frame_bytes = base64.b64decode(frame_data)
-        
+        # Decode raw JPEG bytes
         nparr = np.frombuffer(frame_bytes, np.uint8)
         frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
@@ -498,39 +591,51 @@ def process_frame_basic(frame_data, filters):
                 kernel_size += 1
             processed = cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0)
         
-        # Encode back to base64
+        # Encode back to JPEG
         _, buffer = cv2.imencode('.jpg', processed, [cv2.IMWRITE_JPEG_QUALITY, 75])
-        encoded_frame = base64.b64encode(buffer).decode('utf-8')
         
-        return f"data:image/jpeg;base64,{encoded_frame}"
+        return buffer.tobytes()
         
     except Exception as e:
         raise Exception(f"Frame processing error: {str(e)}")
 
+def read_chunk(stream):
+    # Each chunk is a 4-byte big-endian length followed by the payload
+    prefix = stream.read(4)
+    if len(prefix) != 4:
+        raise EOFError("Unexpected end of input")
+    (length,) = struct.unpack(">I", prefix)
+    data = stream.read(length)
+    if len(data) != length:
+        raise EOFError("Unexpected end of input")
+    return data
+
+def write_response(stream, header, frame_bytes=b''):
+    header_bytes = json.dumps(header).encode('utf-8')
+    stream.write(struct.pack(">I", len(header_bytes)) + header_bytes)
+    stream.write(struct.pack(">I", len(frame_bytes)) + frame_bytes)
+    stream.flush()
+
 def main():
-    try:
-        input_data = sys.stdin.read()
-        data = json.loads(input_data)
-        
-        frame_data = data['frameData']
-        filters = data['filters']
-        
-        processed_frame = process_frame_basic(frame_data, filters)
-        
-        result = {
-            'success': True,
-            'processedFrame': processed_frame
-        }
-        
-        print(json.dumps(result))
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    
+    while True:
+        try:
+            header_bytes = read_chunk(stdin)
+            frame_bytes = read_chunk(stdin)
+        except EOFError:
+            break
         
-    except Exception as e:
-        error_result = {
-            'success': False,
-            'error': str(e)
-        }
-        print(json.dumps(error_result))
-        sys.exit(1)
+        try:
+            filters = json.loads(header_bytes).get('filters', {})
+            
+            processed_frame = process_frame_basic(frame_bytes, filters)
+            
+            write_response(stdout, {'success': True}, processed_frame)
+            
+        except Exception as e:
+            write_response(stdout, {'success': False, 'error': str(e)})
 
 if __name__ == '__main__':
     main()
@@ -292,6 +292,11 @@ async function processVideoFrame(clientId, payload, ws) {
     // Process frame with lightweight Python AI pipeline
     const processedFrame = await processFrameWithLightweightAI(frameData, stream.filters);
     
+    // Frame was dropped because the processor is busy
+    if (!processedFrame) {
+      return;
+    }
+    
     // Send processed frame back
     ws.send(JSON.stringify({
       type: 'processed-frame',
@@ -322,58 +327,150 @@ async function processVideoFrame(clientId, payload, ws) {
   }
 }
 
+// Frames exchanged with process_frame.py are length-prefixed chunks:
+// a 4-byte big-endian length followed by the payload bytes.
+function encodeChunk(payload) {
+  const length = Buffer.alloc(4);
+  length.writeUInt32BE(payload.length, 0);
+  return Buffer.concat([length, payload]);
+}
+
+// Long-running Python worker, spawned on first use so the AI models are
+// only initialized once. Responses come back in request order.
+let frameWorker = null;
+
+// Frames already queued on the worker before new ones are dropped
+const MAX_PENDING_FRAMES = 3;
+
+function getFrameWorker() {
+  if (frameWorker) {
+    return frameWorker;
+  }
+  
+  const python = spawn('python3', ['process_frame.py'], {
+    stdio: ['pipe', 'pipe', 'pipe']
+  });
+  
+  const worker = {
+    python,
+    pending: [],
+    buffer: Buffer.alloc(0)
+  };
+  
+  python.stdout.on('data', (data) => {
+    worker.buffer = Buffer.concat([worker.buffer, data]);
+    
+    // Each response is a JSON status chunk followed by a JPEG chunk
+    while (worker.buffer.length >= 4) {
+      const headerLength = worker.buffer.readUInt32BE(0);
+      const frameOffset = 4 + headerLength;
+      if (worker.buffer.length < frameOffset + 4) {
+        break;
+      }
+      const frameLength = worker.buffer.readUInt32BE(frameOffset);
+      const end = frameOffset + 4 + frameLength;
+      if (worker.buffer.length < end) {
+        break;
+      }
+      
+      const header = worker.buffer.subarray(4, frameOffset);
+      const frame = worker.buffer.subarray(frameOffset + 4, end);
+      worker.buffer = worker.buffer.subarray(end);
+      
+      const request = worker.pending.shift();
+      if (!request || request.settled) {
+        continue;
+      }
+      
+      request.settled = true;
+      clearTimeout(request.timeout);
+      try {
+        const result = JSON.parse(header.toString('utf8'));
+        if (result.success) {
+          request.resolve(`data:image/jpeg;base64,${frame.toString('base64')}`);
+        } else {
+          request.reject(new Error(result.error || 'Processing failed'));
+        }
+      } catch (e) {
+        request.reject(new Error('Failed to parse Python output'));
+      }
+    }
+  });
+  
+  python.stderr.on('data', (data) => {
+    const message = data.toString().trim();
+    if (message) {
+      console.error(`Python worker: ${message}`);
+    }
+  });
+  
+  const failPending = (message) => {
+    if (frameWorker === worker) {
+      frameWorker = null;
+    }
+    for (const request of worker.pending) {
+      if (!request.settled) {
+        request.settled = true;
+        clearTimeout(request.timeout);
+        request.reject(new Error(message));
+      }
+    }
+    worker.pending = [];
+  };
+  
+  python.on('close', (code) => {
+    failPending(`Python process exited with code ${code}`);
+  });
+  
+  python.on('error', (err) => {
+    failPending(`Failed to spawn Python process: ${err.message}`);
+  });
+  
+  python.stdin.on('error', (err) => {
+    failPending(`Failed to write to Python process: ${err.message}`);
+  });
+  
+  frameWorker = worker;
+  return worker;
+}
+
 async function processFrameWithLightweightAI(frameData, filters) {
   return new Promise((resolve, reject) => {
-    const timeout = setTimeout(() => {
-      reject(new Error('Frame processing timeout'));
-    }, 10000); // 10 second timeout
-    
-    // Spawn Python process for lightweight AI processing
-    const python = spawn('python3', ['process_frame.py'], {
-      stdio: ['pipe', 'pipe', 'pipe']
-    });
+    const worker = getFrameWorker();
     
-    let output = '';
-    let error = '';
-    
-    python.stdout.on('data', (data) => {
-      output += data.toString();
-    });
+    // Drop the frame when the worker is falling behind, rather than letting
+    // the queue grow with frames that will time out anyway
+    if (worker.pending.length >= MAX_PENDING_FRAMES) {
+      resolve(null);
+      return;
+    }
     
-    python.stderr.on('data', (data) => {
-      error += data.toString();
-    });
+    const request = { resolve, reject, settled: false };
     
-    python.on('close', (code) => {
-      clearTimeout(timeout);
-      
-      if (code === 0) {
-        try {
-          const result = JSON.parse(output);
-          if (result.success) {
-            resolve(result.processedFrame);
-          } else {
-            reject(new Error(result.error || 'Processing failed'));
-          }
-        } catch (e) {
-          reject(new Error('Failed to parse Python output'));
-        }
-      } else {
-        reject(new Error(`Python process failed with code ${code}: ${error}`));
+    request.timeout = setTimeout(() => {
+      // A stuck worker would time out every later frame too, so kill it;
+      // its close handler rejects the rest and the next frame respawns it
+      request.settled = true;
+      reject(new Error('Frame processing timeout'));
+      if (frameWorker === worker) {
+        frameWorker = null;
       }
-    });
+      worker.python.kill();
+    }, 10000); // 10 second timeout
     
-    python.on('error', (err) => {
-      clearTimeout(timeout);
-      reject(new Error(`Failed to spawn Python process: ${err.message}`));
-    });
+    worker.pending.push(request);
     
-    // Send input data to Python process
+    // Send filters header and raw JPEG bytes to the Python worker
     try {
-      python.stdin.write(JSON.stringify({ frameData, filters }));
-      python.stdin.end();
+      // Strip the data-URL prefix without splitting the whole payload
+      const commaIndex = frameData.indexOf(',');
+      const base64Data = commaIndex >= 0 ? frameData.slice(commaIndex + 1) : frameData;
+      worker.python.stdin.write(encodeChunk(Buffer.from(JSON.stringify({ filters }))));
+      worker.python.stdin.write(encodeChunk(Buffer.from(base64Data, 'base64')));
     } catch (err) {
-      clearTimeout(timeout);
+      worker.pending.splice(worker.pending.indexOf(request), 1);
+      request.settled = true;
+      clearTimeout(request.timeout);
       reject(new Error(`Failed to write to Python process: ${err.message}`));
     }
   });